@@ -1,96 +1,169 @@
 from fastmcp import FastMCP
-from pydantic import BaseModel, Field
+import asyncio
+import inspect
 import os
-import json
+import msgspec
 from pathlib import Path
 
 # Initialize the MCP Server
 mcp = FastMCP("Canton Ledgerview Assistant")
 
-# --- Helper Models (Pydantic) ---
-class ProjectSummary(BaseModel):
-    name: str
-    dependencies: dict[str, str] = Field(default_factory=dict)
-    total_files: int
-
 # --- Resources (The "Intelligence") ---
 # These serve the embedded documentation files as MCP Resources.
 # Agents can read these to understand Canton/DAML architecture.
 
 DOCS_DIR = Path(__file__).parent.parent / "docs"
 
+# Documentation contents keyed by filename, stored with the file's mtime so
+# edits on disk are picked up without re-reading unchanged files. No lock: each
+# get/set/pop is atomic, and two threads racing on a miss just both read the file.
+_DOC_CACHE: dict[str, tuple[int, str]] = {}
+
+def _doc_mtime(filename: str) -> int | None:
+    """Returns the doc's mtime, or None if the file is missing."""
+    try:
+        return (DOCS_DIR / filename).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _doc_text(filename: str, mtime: int | None) -> str:
+    """Returns a doc's contents for an mtime the caller has already stat'ed."""
+    if mtime is None:
+        return f"Error: Documentation file {filename} not found."
+
+    cached = _DOC_CACHE.get(filename)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    text = (DOCS_DIR / filename).read_text()
+    _DOC_CACHE[filename] = (mtime, text)
+    return text
+
 def _read_doc(filename: str) -> str:
-    """Helper to read documentation files."""
-    doc_path = DOCS_DIR / filename
-    if doc_path.exists():
-        return doc_path.read_text()
-    return f"Error: Documentation file {filename} not found."
-
-@mcp.resource("canton://docs/ledger-model")
-def get_ledger_model() -> str:
-    """Returns the complete DAML Ledger Model documentation."""
-    return _read_doc("daml_ledger_model.md")
-
-@mcp.resource("canton://docs/architecture")
-def get_canton_architecture() -> str:
-    """Returns the Canton Network architecture and deployment guide."""
-    return _read_doc("canton_architecture.md")
-
-@mcp.resource("canton://docs/language-reference")
-def get_daml_language_reference() -> str:
-    """Returns the DAML language reference and syntax guide."""
-    return _read_doc("daml_language_reference.md")
-
-@mcp.resource("canton://docs/chainsafe-mcp")
-def get_chainsafe_mcp_reference() -> str:
-    """Returns the ChainSafe Canton MCP Server architecture and tool implementation guide."""
-    return _read_doc("chainsafe_mcp_reference.md")
-
-@mcp.resource("canton://docs/llm-architecture")
-def get_llm_architecture() -> str:
-    """Returns the LLM-Primary Architecture for DAML analysis."""
-    return _read_doc("llm_architecture.md")
-
-@mcp.resource("canton://docs/quickstart-demo")
-def get_quickstart_demo() -> str:
-    """Returns the Canton Network Quickstart Demo walkthrough guide."""
-    return _read_doc("canton_quickstart_demo.md")
+    """Helper to read documentation files (cached by mtime)."""
+    return _doc_text(filename, _doc_mtime(filename))
+
+# Single source of truth for the embedded docs: (uri, filename, name, description).
+# The MCP resource registrations and the HTTP resource endpoints are all built from this.
+DOC_RESOURCES = (
+    ("canton://docs/ledger-model", "daml_ledger_model.md", "DAML Ledger Model",
+     "Returns the complete DAML Ledger Model documentation."),
+    ("canton://docs/architecture", "canton_architecture.md", "Canton Architecture",
+     "Returns the Canton Network architecture and deployment guide."),
+    ("canton://docs/language-reference", "daml_language_reference.md", "DAML Language Reference",
+     "Returns the DAML language reference and syntax guide."),
+    ("canton://docs/chainsafe-mcp", "chainsafe_mcp_reference.md", "ChainSafe MCP Reference",
+     "Returns the ChainSafe Canton MCP Server architecture and tool implementation guide."),
+    ("canton://docs/llm-architecture", "llm_architecture.md", "LLM Architecture",
+     "Returns the LLM-Primary Architecture for DAML analysis."),
+    ("canton://docs/quickstart-demo", "canton_quickstart_demo.md", "Quickstart Demo",
+     "Returns the Canton Network Quickstart Demo walkthrough guide."),
+    ("canton://docs/daml-intro", "daml_introduction.md", "DAML Introduction",
+     "Returns the DAML Introduction and Tutorial."),
+    ("canton://docs/daml-patterns", "daml_patterns.md", "DAML Patterns",
+     "Returns the DAML Design Patterns and Anti-Patterns guide."),
+    ("canton://docs/splice-overview", "splice_overview.md", "Splice Overview",
+     "Returns the Splice & Global Synchronizer Overview."),
+    ("canton://docs/splice-scan-api", "splice_scan_api.md", "Splice Scan API",
+     "Returns the Splice Scan API Reference."),
+)
+
+URI_TO_FILE = {uri: filename for uri, filename, _, _ in DOC_RESOURCES}
+
+RESOURCES_PAYLOAD = {
+    "resources": [
+        {"name": name, "uri": uri, "mimeType": "text/markdown"}
+        for uri, _, name, _ in DOC_RESOURCES
+    ]
+}
+
+# Pre-encoded /resources/read JSON bodies keyed by URI, stored with the doc's mtime.
+# Written from worker threads; lock-free for the same reason as _DOC_CACHE.
+_PAYLOAD_CACHE: dict[str, tuple[int | None, bytes]] = {}
+
+# In-flight payload builds keyed by URI, so concurrent cold reads share one disk read + encode.
+_INFLIGHT: dict[str, asyncio.Future] = {}
+
+def _cached_resource_payload(uri: str, mtime: int | None) -> bytes | None:
+    """Returns the cached resources/read body for uri if it was built for this mtime."""
+    cached = _PAYLOAD_CACHE.get(uri)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    return None
+
+def _resource_payload(uri: str, filename: str, mtime: int | None) -> bytes:
+    """Encodes and caches the MCP resources/read body for a documentation URI."""
+    payload = msgspec.json.encode({
+        "contents": [{
+            "uri": uri,
+            "mimeType": "text/markdown",
+            "text": _doc_text(filename, mtime)
+        }]
+    })
+    _PAYLOAD_CACHE[uri] = (mtime, payload)
+    return payload
+
+def _finish_inflight(uri: str, task: asyncio.Future) -> None:
+    """Clears a finished build and marks its exception retrieved, in case every waiter left."""
+    _INFLIGHT.pop(uri, None)
+    if not task.cancelled():
+        task.exception()
+
+async def _load_resource_payload(uri: str, filename: str, mtime: int | None) -> bytes:
+    """Builds the resources/read body off the event loop, coalescing concurrent callers."""
+    task = _INFLIGHT.get(uri)
+    if task is None:
+        task = asyncio.ensure_future(asyncio.to_thread(_resource_payload, uri, filename, mtime))
+        _INFLIGHT[uri] = task
+        task.add_done_callback(lambda t: _finish_inflight(uri, t))
+    # Shielded so one disconnecting client does not cancel the read for the others.
+    return await asyncio.shield(task)
+
+def _register_doc_resource(uri: str, filename: str, name: str, description: str) -> None:
+    """Registers a documentation file as an MCP resource."""
+    def read_doc() -> str:
+        return _read_doc(filename)
+
+    mcp.resource(uri, name=name, description=description, mime_type="text/markdown")(read_doc)
+
+for _uri, _filename, _name, _description in DOC_RESOURCES:
+    _register_doc_resource(_uri, _filename, _name, _description)
+
+# Rendered list_available_docs output, stored with the docs directory's mtime so
+# files added by another worker process are picked up; reset by add_documentation.
+_DOCS_LIST_CACHE: tuple[int, str] | None = None
+
+def _render_doc_list() -> str:
+    """Renders the list_available_docs output from the markdown files in DOCS_DIR."""
+    stems = sorted(name[:-3] for name in os.listdir(DOCS_DIR) if name.endswith(".md"))
+    if not stems:
+        return "No documentation files found."
+    return "Available Documentation Resources:\n" + "\n".join(
+        f"- {stem}: canton://docs/{stem.replace('_', '-')}" for stem in stems
+    )
 
 @mcp.tool()
 def list_available_docs() -> str:
     """Lists all available Canton/DAML documentation resources."""
-    docs = list(DOCS_DIR.glob("*.md"))
-    if not docs:
+    global _DOCS_LIST_CACHE
+    try:
+        mtime = DOCS_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
         return "No documentation files found."
-    
-    doc_list = []
-    for doc in sorted(docs):
-        doc_list.append(f"- {doc.stem}: canton://docs/{doc.stem.replace('_', '-')}")
-    
-    return "Available Documentation Resources:\n" + "\n".join(doc_list)
+    if _DOCS_LIST_CACHE is not None and _DOCS_LIST_CACHE[0] == mtime:
+        return _DOCS_LIST_CACHE[1]
 
-@mcp.resource("canton://docs/daml-intro")
-def get_daml_introduction() -> str:
-    """Returns the DAML Introduction and Tutorial."""
-    return _read_doc("daml_introduction.md")
+    text = _render_doc_list()
+    _DOCS_LIST_CACHE = (mtime, text)
+    return text
 
-@mcp.resource("canton://docs/daml-patterns")
-def get_daml_patterns() -> str:
-    """Returns the DAML Design Patterns and Anti-Patterns guide."""
-    return _read_doc("daml_patterns.md")
-
-@mcp.resource("canton://docs/splice-overview")
-def get_splice_overview() -> str:
-    """Returns the Splice & Global Synchronizer Overview."""
-    return _read_doc("splice_overview.md")
-
-@mcp.resource("canton://docs/splice-scan-api")
-def get_splice_scan_api() -> str:
-    """Returns the Splice Scan API Reference."""
-    return _read_doc("splice_scan_api.md")
+def _write_new_file(path: Path, content: str) -> None:
+    """Writes content to path, raising FileExistsError if it already exists."""
+    with open(path, "x") as f:
+        f.write(content)
 
 @mcp.tool()
-def add_documentation(filename: str, content: str, description: str = "") -> str:
+async def add_documentation(filename: str, content: str, description: str = "") -> str:
     """
     Adds a new documentation file to the MCP server's knowledge base.
     
@@ -99,6 +172,7 @@ def add_documentation(filename: str, content: str, description: str = "") -> str
         content: The markdown content of the documentation
         description: Short description of what this doc covers
     """
+    global _DOCS_LIST_CACHE
     if not filename.endswith(".md"):
         filename += ".md"
     
@@ -107,40 +181,66 @@ def add_documentation(filename: str, content: str, description: str = "") -> str
     file_path = DOCS_DIR / safe_filename
     
     try:
-        if file_path.exists():
-            return f"Error: File '{safe_filename}' already exists. Please use a different name or manually update it."
-            
-        file_path.write_text(content)
+        await asyncio.to_thread(_write_new_file, file_path, content)
+        _DOC_CACHE.pop(safe_filename, None)
+        _DOCS_LIST_CACHE = None
         return f"Successfully added documentation: {safe_filename}\nIt will be available via the 'list_available_docs' tool."
+    except FileExistsError:
+        return f"Error: File '{safe_filename}' already exists. Please use a different name or manually update it."
     except Exception as e:
         return f"Failed to save documentation: {str(e)}"
 
 # --- Tools ---
 
+_NO_SIG_MSG = "Warning: No signatories defined. This contract might be unauthorized."
+_NO_CTL_MSG = "Warning: No controllers defined. The contract may be immutable/unusable."
+_ISSUES_HEADER = "❌ Safety Issues Found:\n- "
+
+# Every possible analyze_daml_safety result, keyed by (has_signatory, has_controller).
+_SAFETY_RESULTS = {
+    (True, True): "✅ DAML code passes basic safety gate analysis.",
+    (False, True): _ISSUES_HEADER + _NO_SIG_MSG,
+    (True, False): _ISSUES_HEADER + _NO_CTL_MSG,
+    (False, False): _ISSUES_HEADER + _NO_SIG_MSG + "\n- " + _NO_CTL_MSG,
+}
+
 @mcp.tool()
 async def analyze_daml_safety(code: str) -> str:
     """
     Analyzes DAML code against the Canton Safety Gates.
     This simulates the 'intelligent' reasoning by checking for specific safety markers.
     """
-    issues = []
-    if "signatory" not in code.lower():
-        issues.append("Warning: No signatories defined. This contract might be unauthorized.")
-    if "controller" not in code.lower():
-        issues.append("Warning: No controllers defined. The contract may be immutable/unusable.")
-    
-    if not issues:
-        return "✅ DAML code passes basic safety gate analysis."
-    return "❌ Safety Issues Found:\n- " + "\n- ".join(issues)
+    lowered = code.lower()
+    return _SAFETY_RESULTS["signatory" in lowered, "controller" in lowered]
+
+_PROD_SCRIPT = "# PROD DEPLOYMENT\n# 1. Verify DCAP settings\n# 2. Check x402 payment routes\n# 3. Submit to Canton Ledger"
+_DEV_SCRIPT = "# DEV DEPLOYMENT\n# 1. daml build\n# 2. daml ledger upload-dar --host localhost --port 6865"
+_DEPLOYMENT_SCRIPTS = {"prod": _PROD_SCRIPT, "dev": _DEV_SCRIPT}
 
 @mcp.tool()
 def generate_canton_deployment_script(network_type: str = "dev") -> str:
     """
     Generates a starter deployment script for a Canton network.
     """
-    if network_type == "prod":
-        return "# PROD DEPLOYMENT\n# 1. Verify DCAP settings\n# 2. Check x402 payment routes\n# 3. Submit to Canton Ledger"
-    return "# DEV DEPLOYMENT\n# 1. daml build\n# 2. daml ledger upload-dar --host localhost --port 6865"
+    return _DEPLOYMENT_SCRIPTS.get(network_type, _DEV_SCRIPT)
+
+def _count_files(path: str) -> int:
+    """Counts files under path, skipping node_modules directories entirely."""
+    count = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != "node_modules":
+                            stack.append(entry.path)
+                    else:
+                        count += 1
+        except OSError:
+            # Unreadable directories are skipped, as Path.rglob did.
+            continue
+    return count
 
 @mcp.tool()
 def get_project_summary(project_path: str = ".") -> str:
@@ -152,245 +252,215 @@ def get_project_summary(project_path: str = ".") -> str:
     """
     base_path = Path(project_path).resolve()
     
-    # Check for package.json
     package_json_path = base_path / "package.json"
-    if not package_json_path.exists():
-        return f"Error: No package.json found at {base_path}"
     
     try:
-        with open(package_json_path, 'r') as f:
-            data = json.load(f)
+        data = msgspec.json.decode(package_json_path.read_bytes())
             
         name = data.get("name", "Unknown")
         deps = data.get("dependencies", {})
         
         # Count files roughly (ignoring node_modules)
-        file_count = 0
-        for _ in base_path.rglob("*"):
-             if "node_modules" not in str(_):
-                 file_count += 1
+        file_count = _count_files(str(base_path))
 
         return f"Project: {name}\nDependencies: {', '.join(deps.keys())}\nEstimated Files: {file_count}"
 
+    except FileNotFoundError:
+        return f"Error: No package.json found at {base_path}"
+    except msgspec.DecodeError as e:
+        return f"Failed to parse package.json: {str(e)}"
     except Exception as e:
         return f"Failed to analyze project: {str(e)}"
 
+_STATUS_MSG = "Server is running and healthy!"
+
 @mcp.tool()
 def check_server_status() -> str:
     """Returns a simple 'OK' if the server is up."""
-    return "Server is running and healthy!"
+    return _STATUS_MSG
+
+# HTTP dispatch table: tool name -> the function registered with MCP.
+# FastMCP 2.x decorators return the Tool object, which keeps the original function on .fn.
+_TOOL_DISPATCH = {
+    fn.__name__: fn
+    for fn in (
+        getattr(tool, "fn", tool)
+        for tool in (
+            analyze_daml_safety,
+            generate_canton_deployment_script,
+            get_project_summary,
+            check_server_status,
+            list_available_docs,
+            add_documentation,
+        )
+    )
+}
+
+# Encoded HTTP tool responses for the fixed strings tools can return, built once
+# so call_tool can send them without serializing again.
+_STATIC_TOOL_RESPONSES = {
+    text: msgspec.json.encode({"content": [{"type": "text", "text": text}], "isError": False})
+    for text in (_STATUS_MSG, *_DEPLOYMENT_SCRIPTS.values(), *_SAFETY_RESULTS.values())
+}
+
+def create_app():
+    """Builds the FastAPI app exposing the MCP tools and resources over HTTP."""
+    from fastapi import FastAPI, HTTPException, Request
+    from fastapi.responses import FileResponse, JSONResponse, Response
+    from typing import Any
+    
+    class MsgspecJSONResponse(JSONResponse):
+        def render(self, content: Any) -> bytes:
+            return msgspec.json.encode(content)
+    
+    app = FastAPI(title="Canton Ledgerview MCP Server", default_response_class=MsgspecJSONResponse)
+    
+    # Request bodies are decoded and validated by msgspec in one pass.
+    class ToolCallRequest(msgspec.Struct):
+        arguments: dict[str, Any] = {}
+    
+    class ResourceReadRequest(msgspec.Struct):
+        uri: str
+    
+    async def decode_body(request: Request, type_):
+        try:
+            return msgspec.json.decode(await request.body(), type=type_)
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    
+    def request_body_schema(type_) -> dict:
+        """OpenAPI requestBody for a route that decodes its body with msgspec."""
+        _, components = msgspec.json.schema_components([type_])
+        return {
+            "requestBody": {
+                "required": True,
+                "content": {"application/json": {"schema": components[type_.__name__]}}
+            }
+        }
+    
+    @app.get("/")
+    async def root():
+        return {"message": "Canton Ledgerview MCP Server", "status": "running"}
+    
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+    
+    @app.get("/tools")
+    async def list_tools():
+        return {
+            "tools": [
+                {"name": "analyze_daml_safety", "description": "Analyzes DAML code against Canton Safety Gates"},
+                {"name": "generate_canton_deployment_script", "description": "Generates Canton deployment script"},
+                {"name": "get_project_summary", "description": "Returns project summary"},
+                {"name": "check_server_status", "description": "Returns server status"},
+                {"name": "list_available_docs", "description": "Lists available documentation"},
+                {"name": "add_documentation", "description": "Adds new documentation"}
+            ]
+        }
+    
+    @app.post("/tools/{tool_name}/call", openapi_extra=request_body_schema(ToolCallRequest))
+    async def call_tool(tool_name: str, request: Request):
+        fn = _TOOL_DISPATCH.get(tool_name)
+        if fn is None:
+            raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
+    
+        args = (await decode_body(request, ToolCallRequest)).arguments
+        try:
+            if inspect.iscoroutinefunction(fn):
+                result = await fn(**args)
+            else:
+                # Sync tools do blocking file I/O; keep it off the event loop.
+                result = await asyncio.to_thread(fn, **args)
+    
+            body = _STATIC_TOOL_RESPONSES.get(result)
+            if body is not None:
+                return Response(content=body, media_type="application/json")
+            return {
+                "content": [{"type": "text", "text": result}],
+                "isError": False
+            }
+        except Exception as e:
+            return {
+                "content": [{"type": "text", "text": f"Error: {str(e)}"}],
+                "isError": True
+            }
+    
+    @app.get("/resources")
+    async def list_resources():
+        return RESOURCES_PAYLOAD
+    
+    @app.post("/resources/read", openapi_extra=request_body_schema(ResourceReadRequest))
+    async def read_resource(request: Request):
+        uri = (await decode_body(request, ResourceReadRequest)).uri
+        filename = URI_TO_FILE.get(uri)
+        if filename is None:
+            raise HTTPException(status_code=404, detail=f"Resource '{uri}' not found")
+    
+        try:
+            # One stat per request; the cache check and any rebuild both use this mtime.
+            mtime = _doc_mtime(filename)
+            payload = _cached_resource_payload(uri, mtime)
+            if payload is None:
+                payload = await _load_resource_payload(uri, filename, mtime)
+            return Response(content=payload, media_type="application/json")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @app.get("/resources/raw/{name}")
+    async def read_resource_raw(name: str):
+        uri = f"canton://docs/{name}"
+        filename = URI_TO_FILE.get(uri)
+        if filename is None:
+            raise HTTPException(status_code=404, detail=f"Resource '{uri}' not found")
+    
+        doc_path = DOCS_DIR / filename
+        try:
+            stat_result = doc_path.stat()
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail=f"Documentation file {filename} not found")
+    
+        # FileResponse streams straight from the file (sendfile where available).
+        return FileResponse(doc_path, media_type="text/markdown", stat_result=stat_result)
+    
+    return app
 
 # Entry point for 'uv run'
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Canton Ledgerview MCP Server")
+    parser.add_argument("--http", action="store_true", default=bool(os.getenv("MCP_HTTP_MODE")),
+                        help="serve the HTTP API instead of MCP over stdio")
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--workers", type=int)
+    # Unrecognised arguments are ignored, as the previous hand-rolled parsing did.
+    cli_args, _ = parser.parse_known_args()
     
     # Check if we're running in HTTP mode (for Docker)
-    if "--http" in sys.argv or os.getenv("MCP_HTTP_MODE"):
-        host = "0.0.0.0"
-        port = 8000
-        
-        # Parse command line arguments
-        for i, arg in enumerate(sys.argv):
-            if arg == "--host" and i + 1 < len(sys.argv):
-                host = sys.argv[i + 1]
-            elif arg == "--port" and i + 1 < len(sys.argv):
-                port = int(sys.argv[i + 1])
-        
-        # Use environment variables if available
-        host = os.getenv("HOST", host)
-        port = int(os.getenv("PORT", port))
+    if cli_args.http:
+        # HOST/PORT/WORKERS (used by docker-compose) are only read in HTTP mode, so a
+        # stray value in an MCP client's environment cannot break the stdio server.
+        # CLI flags override them.
+        host = cli_args.host or os.getenv("HOST", "0.0.0.0")
+        try:
+            port = cli_args.port if cli_args.port is not None else int(os.getenv("PORT", "8000"))
+            workers = cli_args.workers if cli_args.workers is not None else int(os.getenv("WORKERS", os.cpu_count() or 1))
+        except ValueError as e:
+            parser.error(f"invalid PORT or WORKERS environment variable: {e}")
         
         print(f"Starting Canton Ledgerview MCP Server on {host}:{port}")
         
-        # Create HTTP server with MCP endpoints
+        # uvloop and httptools are picked up automatically where installed.
         import uvicorn
-        from fastapi import FastAPI, HTTPException
-        from fastapi.responses import JSONResponse
-        from pydantic import BaseModel
-        from typing import Dict, Any, List
-        
-        app = FastAPI(title="Canton Ledgerview MCP Server")
-        
-        class ToolCallRequest(BaseModel):
-            arguments: Dict[str, Any] = {}
-        
-        class ResourceReadRequest(BaseModel):
-            uri: str
-        
-        @app.get("/")
-        async def root():
-            return {"message": "Canton Ledgerview MCP Server", "status": "running"}
-        
-        @app.get("/health")
-        async def health():
-            return {"status": "healthy"}
-        
-        @app.get("/tools")
-        async def list_tools():
-            return {
-                "tools": [
-                    {"name": "analyze_daml_safety", "description": "Analyzes DAML code against Canton Safety Gates"},
-                    {"name": "generate_canton_deployment_script", "description": "Generates Canton deployment script"},
-                    {"name": "get_project_summary", "description": "Returns project summary"},
-                    {"name": "check_server_status", "description": "Returns server status"},
-                    {"name": "list_available_docs", "description": "Lists available documentation"},
-                    {"name": "add_documentation", "description": "Adds new documentation"}
-                ]
-            }
-        
-        @app.post("/tools/{tool_name}/call")
-        async def call_tool(tool_name: str, request: ToolCallRequest):
-            try:
-                args = request.arguments
-                
-                if tool_name == "analyze_daml_safety":
-                    code = args.get("code", "")
-                    issues = []
-                    if "signatory" not in code.lower():
-                        issues.append("Warning: No signatories defined. This contract might be unauthorized.")
-                    if "controller" not in code.lower():
-                        issues.append("Warning: No controllers defined. The contract may be immutable/unusable.")
-                    
-                    if not issues:
-                        result = "✅ DAML code passes basic safety gate analysis."
-                    else:
-                        result = "❌ Safety Issues Found:\n- " + "\n- ".join(issues)
-                        
-                elif tool_name == "generate_canton_deployment_script":
-                    network_type = args.get("network_type", "dev")
-                    if network_type == "prod":
-                        result = "# PROD DEPLOYMENT\n# 1. Verify DCAP settings\n# 2. Check x402 payment routes\n# 3. Submit to Canton Ledger"
-                    else:
-                        result = "# DEV DEPLOYMENT\n# 1. daml build\n# 2. daml ledger upload-dar --host localhost --port 6865"
-                        
-                elif tool_name == "get_project_summary":
-                    project_path = args.get("project_path", ".")
-                    base_path = Path(project_path).resolve()
-                    
-                    package_json_path = base_path / "package.json"
-                    if not package_json_path.exists():
-                        result = f"Error: No package.json found at {base_path}"
-                    else:
-                        try:
-                            with open(package_json_path, 'r') as f:
-                                data = json.load(f)
-                                
-                            name = data.get("name", "Unknown")
-                            deps = data.get("dependencies", {})
-                            
-                            file_count = 0
-                            for _ in base_path.rglob("*"):
-                                 if "node_modules" not in str(_):
-                                     file_count += 1
-
-                            result = f"Project: {name}\nDependencies: {', '.join(deps.keys())}\nEstimated Files: {file_count}"
-                        except Exception as e:
-                            result = f"Failed to analyze project: {str(e)}"
-                            
-                elif tool_name == "check_server_status":
-                    result = "Server is running and healthy!"
-                    
-                elif tool_name == "list_available_docs":
-                    docs = list(DOCS_DIR.glob("*.md"))
-                    if not docs:
-                        result = "No documentation files found."
-                    else:
-                        doc_list = []
-                        for doc in sorted(docs):
-                            doc_list.append(f"- {doc.stem}: canton://docs/{doc.stem.replace('_', '-')}")
-                        result = "Available Documentation Resources:\n" + "\n".join(doc_list)
-                        
-                elif tool_name == "add_documentation":
-                    filename = args.get("filename", "")
-                    content = args.get("content", "")
-                    description = args.get("description", "")
-                    
-                    if not filename.endswith(".md"):
-                        filename += ".md"
-                    
-                    safe_filename = Path(filename).name
-                    file_path = DOCS_DIR / safe_filename
-                    
-                    try:
-                        if file_path.exists():
-                            result = f"Error: File '{safe_filename}' already exists. Please use a different name or manually update it."
-                        else:
-                            file_path.write_text(content)
-                            result = f"Successfully added documentation: {safe_filename}\nIt will be available via the 'list_available_docs' tool."
-                    except Exception as e:
-                        result = f"Failed to save documentation: {str(e)}"
-                        
-                else:
-                    raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
-                
-                return {
-                    "content": [{"type": "text", "text": result}],
-                    "isError": False
-                }
-            except Exception as e:
-                return {
-                    "content": [{"type": "text", "text": f"Error: {str(e)}"}],
-                    "isError": True
-                }
-        
-        @app.get("/resources")
-        async def list_resources():
-            return {
-                "resources": [
-                    {"name": "DAML Ledger Model", "uri": "canton://docs/ledger-model", "mimeType": "text/markdown"},
-                    {"name": "Canton Architecture", "uri": "canton://docs/architecture", "mimeType": "text/markdown"},
-                    {"name": "DAML Language Reference", "uri": "canton://docs/language-reference", "mimeType": "text/markdown"},
-                    {"name": "ChainSafe MCP Reference", "uri": "canton://docs/chainsafe-mcp", "mimeType": "text/markdown"},
-                    {"name": "LLM Architecture", "uri": "canton://docs/llm-architecture", "mimeType": "text/markdown"},
-                    {"name": "Quickstart Demo", "uri": "canton://docs/quickstart-demo", "mimeType": "text/markdown"},
-                    {"name": "DAML Introduction", "uri": "canton://docs/daml-intro", "mimeType": "text/markdown"},
-                    {"name": "DAML Patterns", "uri": "canton://docs/daml-patterns", "mimeType": "text/markdown"},
-                    {"name": "Splice Overview", "uri": "canton://docs/splice-overview", "mimeType": "text/markdown"},
-                    {"name": "Splice Scan API", "uri": "canton://docs/splice-scan-api", "mimeType": "text/markdown"}
-                ]
-            }
-        
-        @app.post("/resources/read")
-        async def read_resource(request: ResourceReadRequest):
-            try:
-                uri = request.uri
-                
-                # Map URIs to documentation files
-                uri_to_file = {
-                    "canton://docs/ledger-model": "daml_ledger_model.md",
-                    "canton://docs/architecture": "canton_architecture.md",
-                    "canton://docs/language-reference": "daml_language_reference.md",
-                    "canton://docs/chainsafe-mcp": "chainsafe_mcp_reference.md",
-                    "canton://docs/llm-architecture": "llm_architecture.md",
-                    "canton://docs/quickstart-demo": "canton_quickstart_demo.md",
-                    "canton://docs/daml-intro": "daml_introduction.md",
-                    "canton://docs/daml-patterns": "daml_patterns.md",
-                    "canton://docs/splice-overview": "splice_overview.md",
-                    "canton://docs/splice-scan-api": "splice_scan_api.md"
-                }
-                
-                if uri not in uri_to_file:
-                    raise HTTPException(status_code=404, detail=f"Resource '{uri}' not found")
-                
-                filename = uri_to_file[uri]
-                doc_path = DOCS_DIR / filename
-                
-                if doc_path.exists():
-                    content = doc_path.read_text()
-                else:
-                    content = f"Error: Documentation file {filename} not found."
-                
-                return {
-                    "contents": [{
-                        "uri": uri,
-                        "mimeType": "text/markdown",
-                        "text": content
-                    }]
-                }
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
-        
-        uvicorn.run(app, host=host, port=port)
+        if workers == 1:
+            uvicorn.run(create_app(), host=host, port=port)
+        else:
+            # Workers are separate processes, so uvicorn needs an import string for the
+            # factory: the module's real name under `python -m`, or `server` as a script.
+            module = __spec__.name if __spec__ else "server"
+            uvicorn.run(f"{module}:create_app", factory=True, host=host, port=port, workers=workers)
     else:
         # Default stdio mode for MCP
         mcp.run()